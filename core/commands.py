@@ -1,8 +1,11 @@
 # cli/commands.py
 """Módulo para definir el parser y los comandos de la CLI."""
 import argparse
-from core import task_manager
-from core.pomodoro import PomodoroTimer
+import itertools
+import sys
+
+# Los módulos de core (sqlite3, threading) se importan dentro de cada handler
+# para que solo se carguen los que necesita el subcomando invocado.
 
 # Variable global para mantener la instancia del temporizador activo
 active_pomodoro = None
@@ -10,7 +13,10 @@ active_pomodoro = None
 
 def handle_add_task(args):
     """Maneja el comando 'add-task'."""
-    task_manager.add_task(args.title, args.project)
+    from core import task_manager
+
+    if task_manager.add_task(args.title, args.project) is None:
+        return
     print(
         f"✅ Tarea añadida: '{args.title}' al proyecto '{args.project}'."
         if args.project
@@ -20,21 +26,27 @@ def handle_add_task(args):
 
 def handle_add_project(args):
     """Maneja el comando 'add-project'."""
-    task_manager.add_project(args.name)
-    print(f"✅ Proyecto creado: '{args.name}'.")
+    from core import task_manager
+
+    if task_manager.add_project(args.name) is not None:
+        print(f"✅ Proyecto creado: '{args.name}'.")
 
 
 def handle_list_tasks(args):
     """Maneja el comando 'list-tasks'."""
+    from core import task_manager
+
     tasks = task_manager.get_tasks(args.project, args.status)
 
-    if not tasks:
+    # Se mira la primera fila para detectar el resultado vacío sin repetir la consulta
+    first = next(tasks, None)
+    if first is None:
         print("No se encontraron tareas con los filtros especificados.")
         return
 
     print("\n📝 Lista de Tareas:")
     print("-" * 50)
-    for task in tasks:
+    for task in itertools.chain((first,), tasks):
         proj_name = f"({task['project_name']})" if task["project_name"] else ""
         print(
             f"| ID: **{task['id']}** | Título: {task['title']:<30} | Estado: **{task['status']:<10}** {proj_name}"
@@ -44,6 +56,8 @@ def handle_list_tasks(args):
 
 def handle_update_task_status(args):
     """Maneja el comando 'update-status'."""
+    from core import task_manager
+
     if task_manager.update_task_status(args.id, args.status):
         print(f"✅ Estado de Tarea ID {args.id} actualizado a '{args.status}'.")
     else:
@@ -53,6 +67,8 @@ def handle_update_task_status(args):
 def handle_start_pomodoro(args):
     """Maneja el comando 'start-pomodoro'."""
     global active_pomodoro
+    import time
+    from core.pomodoro import PomodoroTimer
 
     if active_pomodoro and active_pomodoro.is_running():
         print(
@@ -60,22 +76,26 @@ def handle_start_pomodoro(args):
         )
         return
 
-    # TODO: Validar que la Tarea ID exista antes de iniciar.
-
+    # start() valida que la Tarea ID exista al registrar la primera sesión.
     active_pomodoro = PomodoroTimer(task_id=args.task)
-    if active_pomodoro.start():
-        # El timer corre en un hilo, el programa debe mantenerse vivo para escucharlo.
+    if not active_pomodoro.start():
         print(
-            "\nPara interactuar (pausa/cancelar), ejecute el comando en otra ventana CLI."
+            f"❌ Error: No se pudo iniciar el Pomodoro. ¿Existe la Tarea ID {args.task}?"
         )
-        # Mantiene el hilo principal vivo mientras el pomodoro esté activo (simple hook para la CLI).
-        try:
-            while active_pomodoro.is_running():
-                time.sleep(1)
-        except KeyboardInterrupt:
-            # Si el usuario presiona CTRL+C, cancelamos.
-            if active_pomodoro.is_running():
-                active_pomodoro.cancel()
+        return
+
+    # El timer corre en un hilo, el programa debe mantenerse vivo para escucharlo.
+    print(
+        "\nPara interactuar (pausa/cancelar), ejecute el comando en otra ventana CLI."
+    )
+    # Mantiene el hilo principal vivo mientras el pomodoro esté activo (simple hook para la CLI).
+    try:
+        while active_pomodoro.is_running():
+            time.sleep(1)
+    except KeyboardInterrupt:
+        # Si el usuario presiona CTRL+C, cancelamos.
+        if active_pomodoro.is_running():
+            active_pomodoro.cancel()
 
 
 def handle_control_pomodoro(args):
@@ -94,17 +114,8 @@ def handle_control_pomodoro(args):
         active_pomodoro.cancel()
 
 
-def create_parser():
-    """Configura el parser de argumentos principal."""
-    parser = argparse.ArgumentParser(
-        description="Py-Focus CLI: Gestor de Tareas y Pomodoro.",
-        formatter_class=argparse.RawTextHelpFormatter,
-    )
-
-    # Subcomandos para las diferentes funcionalidades
-    subparsers = parser.add_subparsers(dest="command", required=True)
-
-    # --- Comando: add-task ---
+def _build_add_task(subparsers):
+    """Construye el subparser 'add-task'."""
     parser_add_task = subparsers.add_parser("add-task", help="Añade una nueva tarea.")
     parser_add_task.add_argument("title", type=str, help="El título de la tarea.")
     parser_add_task.add_argument(
@@ -112,14 +123,18 @@ def create_parser():
     )
     parser_add_task.set_defaults(func=handle_add_task)
 
-    # --- Comando: add-project ---
+
+def _build_add_project(subparsers):
+    """Construye el subparser 'add-project'."""
     parser_add_project = subparsers.add_parser(
         "add-project", help="Crea un nuevo proyecto."
     )
     parser_add_project.add_argument("name", type=str, help="El nombre del proyecto.")
     parser_add_project.set_defaults(func=handle_add_project)
 
-    # --- Comando: list-tasks ---
+
+def _build_list_tasks(subparsers):
+    """Construye el subparser 'list-tasks'."""
     parser_list_tasks = subparsers.add_parser(
         "list-tasks", help="Lista tareas con filtros opcionales."
     )
@@ -135,7 +150,9 @@ def create_parser():
     )
     parser_list_tasks.set_defaults(func=handle_list_tasks)
 
-    # --- Comando: update-status ---
+
+def _build_update_status(subparsers):
+    """Construye el subparser 'update-status'."""
     parser_update_status = subparsers.add_parser(
         "update-status", help="Cambia el estado de una tarea."
     )
@@ -150,7 +167,9 @@ def create_parser():
     )
     parser_update_status.set_defaults(func=handle_update_task_status)
 
-    # --- Comando: start-pomodoro ---
+
+def _build_start_pomodoro(subparsers):
+    """Construye el subparser 'start-pomodoro'."""
     parser_start_pomodoro = subparsers.add_parser(
         "start-pomodoro", help="Inicia un temporizador Pomodoro."
     )
@@ -162,7 +181,9 @@ def create_parser():
     )
     parser_start_pomodoro.set_defaults(func=handle_start_pomodoro)
 
-    # --- Comando: pomodoro-control ---
+
+def _build_pomodoro_control(subparsers):
+    """Construye el subparser 'pomodoro-control'."""
     parser_pomodoro_control = subparsers.add_parser(
         "pomodoro-control", help="Controla un temporizador Pomodoro activo."
     )
@@ -174,4 +195,48 @@ def create_parser():
     )
     parser_pomodoro_control.set_defaults(func=handle_control_pomodoro)
 
+
+# Constructores de subcomandos, en el orden en que aparecen en la ayuda
+SUBCOMMAND_BUILDERS = {
+    "add-task": _build_add_task,
+    "add-project": _build_add_project,
+    "list-tasks": _build_list_tasks,
+    "update-status": _build_update_status,
+    "start-pomodoro": _build_start_pomodoro,
+    "pomodoro-control": _build_pomodoro_control,
+}
+
+
+def create_parser(argv=None):
+    """
+    Configura el parser de argumentos principal.
+
+    Solo se construye el subparser del subcomando invocado; si no se
+    reconoce ninguno (p. ej. '-h' o un comando inválido) se construyen
+    todos para que la ayuda y los mensajes de error sean completos.
+
+    Args:
+        argv (list/None): Argumentos de la CLI. Por defecto, sys.argv[1:].
+
+    Returns:
+        argparse.ArgumentParser: Parser configurado.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        description="Py-Focus CLI: Gestor de Tareas y Pomodoro.",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+
+    # Subcomandos para las diferentes funcionalidades
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    command = argv[0] if argv else None
+    if command in SUBCOMMAND_BUILDERS:
+        SUBCOMMAND_BUILDERS[command](subparsers)
+    else:
+        for build in SUBCOMMAND_BUILDERS.values():
+            build(subparsers)
+
     return parser
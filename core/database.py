@@ -1,76 +1,331 @@
 # core/database.py
 """Módulo para la conexión y operaciones de base de datos SQLite."""
 import sqlite3
-import os
+import queue
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 # Configuración de la ruta de la base de datos
 DB_FILE = Path(__file__).parent.parent / "data" / "py_focus.db"
+# Versión del esquema, guardada en la propia DB (PRAGMA user_version).
+# Incrementarla en cada cambio de DDL para que initialize_db() lo aplique.
+SCHEMA_VERSION = 1
 
+# Marca de tiempo ISO-8601 (UTC) calculada por SQLite en lugar de en Python
+SQL_NOW = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
 
+# Número máximo de conexiones reutilizables por base de datos
+POOL_SIZE = 5
+
+# Segundos que get() espera una conexión libre antes de fallar
+POOL_TIMEOUT = 30
+
+# Sentencias preparadas que cada conexión mantiene compiladas (por texto SQL)
+STATEMENT_CACHE_SIZE = 256
+
+# PRAGMAs aplicados una sola vez al crear cada conexión del pool.
+# WAL permite lecturas concurrentes con un único escritor y, junto con
+# synchronous=NORMAL, evita un fsync completo en cada commit.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA cache_size=-20000;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA mmap_size=268435456;",
+    "PRAGMA foreign_keys=ON;",
+)
+
+# Modelo "múltiples lectores, un solo escritor": serializa INSERT/UPDATE
+_write_gate = threading.BoundedSemaphore(1)
+
+
+def _apply_pragmas(conn):
+    """Aplica los PRAGMAs de rendimiento a una conexión."""
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
+
+
+class ConnectionPool:
+    """Pool LIFO de conexiones SQLite de larga duración."""
+
+    def __init__(self, db_path=DB_FILE, size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        """
+        Inicializa el pool. Las conexiones se crean bajo demanda.
+
+        Args:
+            db_path (Path): Ruta al archivo de la base de datos.
+            size (int): Número máximo de conexiones abiertas.
+            timeout (float): Segundos de espera por una conexión libre.
+        """
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        # El directorio se crea una sola vez por pool, no en cada conexión
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # LIFO: la conexión devuelta más recientemente conserva la caché caliente
+        self._pool = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Abre una nueva conexión y aplica los PRAGMAs de rendimiento."""
+        # check_same_thread=False: el hilo del Pomodoro reutiliza conexiones del pool
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        # Filas con acceso por nombre de columna sin construir diccionarios
+        conn.row_factory = sqlite3.Row
+        _apply_pragmas(conn)
+        return conn
+
+    def get(self):
+        """
+        Devuelve una conexión libre, creando una nueva si el pool no está lleno.
+
+        Raises:
+            TimeoutError: Si no se libera ninguna conexión en self.timeout segundos.
+        """
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+
+        if can_create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        # Pool lleno: esperar a que otra operación libere su conexión
+        try:
+            return self._pool.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No hay conexiones libres a '{self.db_path}' tras {self.timeout} s: "
+                f"las {self.size} del pool siguen en uso (¿un generador de "
+                "get_tasks() sin consumir?)."
+            ) from None
+
+    def put(self, conn):
+        """Devuelve una conexión al pool, descartando transacciones pendientes."""
+        if conn.in_transaction:
+            conn.rollback()
+        self._pool.put(conn)
+
+    def close(self):
+        """Cierra las conexiones libres del pool."""
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(db_path):
+    """Devuelve (creándolo si es necesario) el pool asociado a db_path."""
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = _pools[db_path] = ConnectionPool(db_path)
+        return pool
+
+
+@contextmanager
 def get_connection(db_path=DB_FILE):
     """
-    Establece y devuelve una conexión a la base de datos SQLite.
+    Presta una conexión del pool a la base de datos SQLite.
+
+    La conexión se devuelve al pool al salir del bloque ``with`` en lugar
+    de cerrarse.
 
     Args:
         db_path (Path): Ruta al archivo de la base de datos.
 
-    Returns:
+    Yields:
         sqlite3.Connection: Objeto de conexión a la base de datos.
     """
-    os.makedirs(db_path.parent, exist_ok=True)
-    return sqlite3.connect(db_path)
-
+    pool = _get_pool(db_path)
+    conn = pool.get()
+    try:
+        yield conn
+    finally:
+        pool.put(conn)
 
-def initialize_db():
-    """Crea las tablas Projects, Tasks y Sessions si no existen."""
-    conn = get_connection()
-    cursor = conn.cursor()
 
-    # Tabla Projects
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS projects (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE,
-            created_at TEXT NOT NULL
-        );
+@contextmanager
+def get_write_connection(db_path=DB_FILE):
     """
-    )
+    Presta una conexión del pool reservando el turno de escritura.
 
-    # Tabla Tasks
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            project_id INTEGER,
-            status TEXT NOT NULL DEFAULT 'pendiente', -- pendiente, en progreso, completado
-            is_subtask INTEGER DEFAULT 0,
-            parent_task_id INTEGER,
-            created_at TEXT NOT NULL,
-            FOREIGN KEY (project_id) REFERENCES projects(id)
-        );
+    Solo un escritor a la vez obtiene la conexión; las lecturas con
+    get_connection() no esperan a este turno.
+
+    Args:
+        db_path (Path): Ruta al archivo de la base de datos.
+
+    Yields:
+        sqlite3.Connection: Objeto de conexión a la base de datos.
     """
-    )
+    with _write_gate:
+        with get_connection(db_path) as conn:
+            yield conn
 
-    # Tabla Sessions (para el registro de Pomodoros)
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            task_id INTEGER NOT NULL,
-            start_time TEXT NOT NULL,
-            end_time TEXT,
-            duration_minutes INTEGER,
-            type TEXT NOT NULL, -- trabajo, descanso
-            FOREIGN KEY (task_id) REFERENCES tasks(id)
-        );
+
+_TABLES_SQL = f"""
+-- Tabla Projects
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL DEFAULT ({SQL_NOW})
+);
+
+-- Tabla Tasks
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    project_id INTEGER,
+    status TEXT NOT NULL DEFAULT 'pendiente', -- pendiente, en progreso, completado
+    is_subtask INTEGER DEFAULT 0,
+    parent_task_id INTEGER,
+    created_at TEXT NOT NULL DEFAULT ({SQL_NOW}),
+    FOREIGN KEY (project_id) REFERENCES projects(id)
+);
+
+-- Tabla Sessions (para el registro de Pomodoros)
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    start_time TEXT NOT NULL DEFAULT ({SQL_NOW}),
+    end_time TEXT, -- NULL: sesión en curso o cancelada
+    duration_minutes INTEGER,
+    type TEXT NOT NULL, -- trabajo, descanso
+    FOREIGN KEY (task_id) REFERENCES tasks(id)
+);
+"""
+
+_INDEXES_SQL = """
+-- Índices para los filtros de get_tasks y la búsqueda de proyecto en add_task
+CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks(project_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+-- Compuesto: cubre WHERE status/project_id y el ORDER BY id DESC
+CREATE INDEX IF NOT EXISTS idx_tasks_status_project ON tasks(status, project_id, id DESC);
+-- UNIQUE ya crea uno implícito; se declara para documentar el acceso por nombre
+CREATE UNIQUE INDEX IF NOT EXISTS idx_projects_name ON projects(name);
+"""
+
+# Esquema completo en un único script: BEGIN/COMMIT explícitos para que
+# todo el DDL se confirme de una vez (un solo fsync en una DB nueva).
+_SCHEMA_SQL = f"""
+BEGIN;
+{_TABLES_SQL}
+{_INDEXES_SQL}
+PRAGMA user_version = {SCHEMA_VERSION};
+COMMIT;
+"""
+
+# Migración de las DB creadas antes de que SQLite fijara las marcas de tiempo:
+# sus columnas created_at/start_time son NOT NULL sin DEFAULT. SQLite no
+# permite añadir un DEFAULT con ALTER TABLE, así que se reconstruyen las tablas
+# conservando ids y datos. Requiere foreign_keys=OFF y legacy_alter_table=ON
+# (para que renombrar no reescriba las FOREIGN KEY de las otras tablas).
+_MIGRATE_TIMESTAMP_DEFAULTS_SQL = f"""
+BEGIN;
+DROP INDEX IF EXISTS idx_tasks_project_id;
+DROP INDEX IF EXISTS idx_tasks_status;
+DROP INDEX IF EXISTS idx_tasks_status_project;
+DROP INDEX IF EXISTS idx_projects_name;
+ALTER TABLE projects RENAME TO projects_legacy;
+ALTER TABLE tasks RENAME TO tasks_legacy;
+ALTER TABLE sessions RENAME TO sessions_legacy;
+{_TABLES_SQL}
+INSERT INTO projects (id, name, created_at)
+    SELECT id, name, created_at FROM projects_legacy;
+INSERT INTO tasks (id, title, project_id, status, is_subtask, parent_task_id, created_at)
+    SELECT id, title, project_id, status, is_subtask, parent_task_id, created_at
+    FROM tasks_legacy;
+INSERT INTO sessions (id, task_id, start_time, end_time, duration_minutes, type)
+    SELECT id, task_id, start_time, end_time, duration_minutes, type
+    FROM sessions_legacy;
+DROP TABLE sessions_legacy;
+DROP TABLE tasks_legacy;
+DROP TABLE projects_legacy;
+{_INDEXES_SQL}
+PRAGMA user_version = {SCHEMA_VERSION};
+COMMIT;
+"""
+
+# Columnas de marca de tiempo que el esquema actual rellena con DEFAULT
+_TIMESTAMP_COLUMNS = (
+    ("projects", "created_at"),
+    ("tasks", "created_at"),
+    ("sessions", "start_time"),
+)
+
+
+def _has_legacy_timestamps(conn):
+    """Indica si la DB tiene tablas con marcas de tiempo sin DEFAULT (esquema antiguo)."""
+    for table, column in _TIMESTAMP_COLUMNS:
+        # table_info: (cid, name, type, notnull, dflt_value, pk)
+        for row in conn.execute(f"PRAGMA table_info({table});"):
+            if row[1] == column and row[4] is None:
+                return True
+    return False
+
+
+def _migrate_timestamp_defaults(conn):
+    """Reconstruye las tablas del esquema antiguo con los DEFAULT de marca de tiempo."""
+    # Ambos PRAGMAs se ignoran dentro de una transacción: se fijan antes del script
+    conn.execute("PRAGMA foreign_keys=OFF;")
+    conn.execute("PRAGMA legacy_alter_table=ON;")
+    try:
+        with conn:
+            conn.executescript(_MIGRATE_TIMESTAMP_DEFAULTS_SQL)
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA legacy_alter_table=OFF;")
+        conn.execute("PRAGMA foreign_keys=ON;")
+
+
+def initialize_db(db_path=DB_FILE):
     """
-    )
+    Crea las tablas Projects, Tasks y Sessions (y sus índices) si no existen.
+
+    Solo ejecuta el DDL cuando la versión guardada en la DB no coincide con
+    SCHEMA_VERSION; en el caso habitual cuesta una única lectura de PRAGMA.
+    Las DB con el esquema antiguo se migran conservando sus datos.
 
-    conn.commit()
-    conn.close()
+    Args:
+        db_path (Path): Ruta al archivo de la base de datos.
+    """
+    with get_connection(db_path) as conn:
+        if conn.execute("PRAGMA user_version;").fetchone()[0] == SCHEMA_VERSION:
+            return
+        if _has_legacy_timestamps(conn):
+            _migrate_timestamp_defaults(conn)
+        else:
+            with conn:
+                conn.executescript(_SCHEMA_SQL)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,19 @@
 # core/pomodoro.py
 """Módulo que implementa la lógica del temporizador Pomodoro usando threading."""
+import itertools
+import math
+import sys
 import threading
 import time
-from datetime import datetime
-from .database import get_connection
+from collections import namedtuple
+from .database import SQL_NOW, get_write_connection
 
 DEFAULT_WORK_MIN = 25
 DEFAULT_BREAK_MIN = 5
+DISPLAY_INTERVAL = 5  # Segundos entre actualizaciones de la CLI
+
+# Resultado de una fase: completed=False si la fase fue cancelada
+PhaseResult = namedtuple("PhaseResult", ["completed"])
 
 
 class PomodoroTimer:
@@ -25,131 +32,221 @@ class PomodoroTimer:
         self.work_seconds = work_min * 60
         self.break_seconds = break_min * 60
         self._timer_thread = None
-        self._is_running = False
-        self._is_paused = False
+        # Estado compartido entre hilos como Events: lecturas atómicas sin lock
+        self._is_running = threading.Event()
+        self._is_paused = threading.Event()
+        self._cancel_evt = threading.Event()
+        # Despierta al hilo del temporizador ante pausa, reanudación o cancelación
+        self._wake_evt = threading.Event()
         self._remaining_time = 0
         self._session_type = "trabajo"  # 'trabajo' o 'descanso'
-        self._start_time = None
         self._session_id = None
+        # Protege _session_id y la decisión de lanzar el hilo en start()
         self._lock = threading.Lock()
 
-    def _save_session(self, duration_minutes, session_type, end_time=None):
-        """Guarda un registro de sesión en la base de datos."""
-        conn = get_connection()
-        cursor = conn.cursor()
-        try:
-            if not end_time:
-                end_time = datetime.now().isoformat()
-
-            cursor.execute(
-                "INSERT INTO sessions (task_id, start_time, end_time, duration_minutes, type) VALUES (?, ?, ?, ?, ?)",
-                (
-                    self.task_id,
-                    self._start_time,
-                    end_time,
-                    duration_minutes,
-                    session_type,
-                ),
-            )
-            conn.commit()
-            self._session_id = cursor.lastrowid
-        except Exception as e:
-            print(f"Error al guardar sesión Pomodoro: {e}")
-        finally:
-            conn.close()
+    def _save_session(self, duration_minutes, session_type):
+        """
+        Registra el inicio de una sesión (start_time lo fija SQLite, end_time nulo).
+
+        La existencia de la tarea se valida en la misma sentencia INSERT.
+
+        Returns:
+            bool: True si se registró la sesión, False si la tarea no existe o falla.
+        """
+        with get_write_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    """
+                    INSERT INTO sessions (task_id, duration_minutes, type)
+                    SELECT ?, ?, ?
+                    WHERE EXISTS (SELECT 1 FROM tasks WHERE id = ?)
+                    """,
+                    (self.task_id, duration_minutes, session_type, self.task_id),
+                )
+                conn.commit()
+                saved = cursor.rowcount > 0
+            except Exception as e:
+                print(f"Error al guardar sesión Pomodoro: {e}")
+                saved = False
+
+        # Cada fase registra su propia sesión; no debe heredar la anterior
+        with self._lock:
+            self._session_id = cursor.lastrowid if saved else None
+        return saved
+
+    def _complete_session(self):
+        """Marca la sesión en curso como completada fijando su end_time."""
+        with self._lock:
+            session_id = self._session_id
+        if session_id is None:
+            return
+        with get_write_connection() as conn:
+            try:
+                conn.execute(
+                    f"UPDATE sessions SET end_time = {SQL_NOW} WHERE id = ?",
+                    (session_id,),
+                )
+                conn.commit()
+            except Exception as e:
+                print(f"Error al guardar sesión Pomodoro: {e}")
+
+    def _run_phase(self, duration, session_type):
+        """
+        Ejecuta una fase (trabajo o descanso) del temporizador.
 
-    def _run_timer(self, duration, session_type):
-        """Bucle principal del temporizador, ejecutado en el hilo."""
+        Args:
+            duration (int): Duración de la fase en segundos.
+            session_type (str): 'trabajo' o 'descanso'.
+
+        Returns:
+            PhaseResult: completed=True si la fase terminó sin cancelarse.
+        """
         self._remaining_time = duration
         self._session_type = session_type
-        self._is_running = True
-        self._is_paused = False
-        self._start_time = datetime.now().isoformat()
 
         print(
             f"\n📢 Iniciando sesión de **{session_type.upper()}** para Tarea ID {self.task_id}. Duración: {duration // 60} minutos."
         )
 
-        # Guardamos la sesión como iniciada (end_time nulo)
-        self._save_session(duration // 60, session_type, end_time=None)
-
-        while self._remaining_time > 0 and self._is_running:
-            with self._lock:
-                if not self._is_paused:
-                    mins, secs = divmod(self._remaining_time, 60)
-                    # La CLI se actualiza cada 5 segundos para reducir ruido
-                    if (
-                        self._remaining_time % 5 == 0
-                        or self._remaining_time == duration
-                        or self._remaining_time <= 5
-                    ):
-                        print(
-                            f"⏳ {session_type.capitalize()}: {mins:02d}:{secs:02d} restantes...",
-                            end="\r",
-                        )
-                    time.sleep(1)
-                    self._remaining_time -= 1
-                else:
-                    time.sleep(1)  # Esperar si está en pausa
+        # El hilo duerme hasta el plazo, la próxima actualización de la CLI
+        # o un evento de control, en lugar de despertar cada segundo.
+        started_at = time.monotonic()
+        deadline = started_at + duration
+        next_print_at = started_at  # Primera actualización inmediata
+        paused_at = None
+        while True:
+            # Limpiar antes de leer el estado: cualquier cambio posterior despierta la espera
+            self._wake_evt.clear()
+            if self._cancel_evt.is_set():
+                break
+
+            now = time.monotonic()
+            if self._is_paused.is_set():
+                if paused_at is None:
+                    paused_at = now
+                self._wake_evt.wait()
+                continue
+
+            if paused_at is not None:
+                # Extender el plazo con el tiempo que estuvo en pausa
+                deadline += now - paused_at
+                paused_at = None
+
+            remaining = deadline - now
+            if remaining <= 0:
+                break
+
+            # Solo se escribe en la CLI cuando vence la próxima actualización,
+            # no en cada despertar (p. ej. tras pausar/reanudar).
+            if now >= next_print_at:
+                self._remaining_time = math.ceil(remaining)
+                mins, secs = divmod(self._remaining_time, 60)
+                sys.stdout.write(
+                    f"\r⏳ {session_type.capitalize()}: {mins:02d}:{secs:02d} restantes..."
+                )
+                sys.stdout.flush()
+                next_print_at = now + DISPLAY_INTERVAL
+            self._wake_evt.wait(timeout=min(remaining, next_print_at - now))
 
         # Lógica de finalización/cancelación
-        if self._is_running:  # Finalización normal
-            end_time = datetime.now().isoformat()
-            # Guardamos la sesión completada
-            self._save_session(duration // 60, session_type, end_time=end_time)
-            print(f"\n🎉 ¡Sesión de **{session_type.upper()}** completada!")
-            # Si completamos el trabajo, podríamos iniciar automáticamente el descanso.
-            if session_type == "trabajo":
-                # Esto es solo un ejemplo para demostrar el ciclo, se podría hacer más explícito.
-                print("Iniciando descanso automáticamente...")
-                self._run_timer(self.break_seconds, "descanso")
-        else:  # Cancelación
+        if self._cancel_evt.is_set():
             print(f"\n❌ Sesión de **{session_type.upper()}** cancelada.")
-            # TODO: Lógica para marcar la sesión como incompleta en la DB si es necesario.
-            self._is_running = False
-            self._is_paused = False
+            # La sesión cancelada conserva end_time NULL (igual que una en curso).
+            return PhaseResult(completed=False)
+
+        self._remaining_time = 0
+        # Guardamos la sesión completada
+        self._complete_session()
+        print(f"\n🎉 ¡Sesión de **{session_type.upper()}** completada!")
+        return PhaseResult(completed=True)
+
+    def _thread_main(self, first_phase, next_phases):
+        """
+        Ciclo trabajo → descanso → trabajo…, ejecutado en el hilo hasta cancelar.
+
+        Args:
+            first_phase (tuple): (duración, tipo) de la primera fase; su sesión
+                ya la registró start() al validar la tarea.
+            next_phases (iterator): Fases siguientes; cada una registra su sesión aquí.
+        """
+        try:
+            # Iterativo: la profundidad de pila es constante sin importar cuántas fases corran
+            if not self._run_phase(*first_phase).completed:
+                return
+            for duration, session_type in next_phases:
+                print(f"Iniciando {session_type} automáticamente...")
+                # Guardamos la sesión como iniciada (end_time nulo)
+                if not self._save_session(duration // 60, session_type):
+                    return
+                if not self._run_phase(duration, session_type).completed:
+                    return
+        finally:
+            self._is_paused.clear()
+            self._is_running.clear()
 
     def start(self):
-        """Inicia el temporizador de trabajo en un hilo separado."""
-        if not self._is_running:
-            self._timer_thread = threading.Thread(
-                target=self._run_timer, args=(self.work_seconds, "trabajo")
-            )
-            self._timer_thread.daemon = (
-                True  # Permite que el programa principal termine
-            )
-            self._timer_thread.start()
-            return True
-        return False
+        """
+        Inicia el temporizador de trabajo en un hilo separado.
 
-    def pause(self):
-        """Pausa el temporizador."""
+        Returns:
+            bool: True si arrancó; False si ya estaba activo o la tarea no existe.
+        """
+        # El lock hace atómica la comprobación y la reserva: dos llamadas
+        # concurrentes no pueden crear dos hilos de temporizador.
         with self._lock:
-            if self._is_running and not self._is_paused:
-                self._is_paused = True
-                print("\n⏸️ Temporizador pausado.")
-                return True
+            if self._is_running.is_set():
+                return False
+            self._is_running.set()
+            self._cancel_evt.clear()
+            self._is_paused.clear()
+
+        phases = itertools.cycle(
+            [(self.work_seconds, "trabajo"), (self.break_seconds, "descanso")]
+        )
+        first_phase = next(phases)
+
+        # Registrar la primera sesión valida la tarea antes de lanzar el hilo
+        duration, session_type = first_phase
+        if not self._save_session(duration // 60, session_type):
+            self._is_running.clear()
             return False
 
+        self._timer_thread = threading.Thread(
+            target=self._thread_main, args=(first_phase, phases)
+        )
+        self._timer_thread.daemon = True  # Permite que el programa principal termine
+        self._timer_thread.start()
+        return True
+
+    def pause(self):
+        """Pausa el temporizador."""
+        if self._is_running.is_set() and not self._is_paused.is_set():
+            self._is_paused.set()
+            self._wake_evt.set()
+            print("\n⏸️ Temporizador pausado.")
+            return True
+        return False
+
     def resume(self):
         """Reanuda el temporizador."""
-        with self._lock:
-            if self._is_running and self._is_paused:
-                self._is_paused = False
-                print("\n▶️ Temporizador reanudado.")
-                return True
-            return False
+        if self._is_running.is_set() and self._is_paused.is_set():
+            self._is_paused.clear()
+            self._wake_evt.set()
+            print("\n▶️ Temporizador reanudado.")
+            return True
+        return False
 
     def cancel(self):
         """Detiene y cancela el temporizador."""
-        with self._lock:
-            if self._is_running:
-                self._is_running = False  # Detiene el bucle en _run_timer
-                self._is_paused = False
-                # No es necesario esperar el join, el daemon=True ayuda a la terminación.
-                return True
-            return False
+        if self._is_running.is_set():
+            # El hilo despierta de inmediato y termina la fase en curso
+            self._cancel_evt.set()
+            self._wake_evt.set()
+            # No es necesario esperar el join, el daemon=True ayuda a la terminación.
+            return True
+        return False
 
     def is_running(self):
         """Verifica si el temporizador está activo."""
-        return self._is_running
+        return self._is_running.is_set()
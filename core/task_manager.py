@@ -1,7 +1,34 @@
 # core/task_manager.py
 """Módulo para la gestión de Proyectos y Tareas (CRUD)."""
-from .database import get_connection
-from datetime import datetime
+import sqlite3
+from .database import get_connection, get_write_connection
+
+# El project_id se resuelve dentro del INSERT: una sola ida y vuelta a SQLite.
+# Los textos SQL son constantes para reutilizar la sentencia preparada en caché.
+_INSERT_TASK_SQL = """
+    INSERT INTO tasks (title, project_id)
+    VALUES (?, (SELECT id FROM projects WHERE name = ?))
+"""
+# RETURNING (SQLite >= 3.35) devuelve el project_id resuelto en la misma
+# sentencia; en versiones anteriores una tarea con proyecto cuesta una
+# segunda sentencia para releerlo.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_INSERT_TASK_RETURNING_SQL = _INSERT_TASK_SQL + " RETURNING project_id"
+
+# Variantes precompuestas de get_tasks: cada combinación de filtros tiene un
+# texto SQL fijo, así SQLite reutiliza su sentencia preparada en caché.
+_SELECT_TASKS_SQL = """
+    SELECT
+        t.id, t.title, p.name as project_name, t.status
+    FROM tasks t
+    LEFT JOIN projects p ON t.project_id = p.id
+"""
+_Q_ALL = _SELECT_TASKS_SQL + " ORDER BY t.id DESC"
+_Q_STATUS = _SELECT_TASKS_SQL + " WHERE t.status = ? ORDER BY t.id DESC"
+_Q_PROJ = _SELECT_TASKS_SQL + " WHERE p.name = ? ORDER BY t.id DESC"
+_Q_BOTH = _SELECT_TASKS_SQL + " WHERE p.name = ? AND t.status = ? ORDER BY t.id DESC"
+# Índice: (hay proyecto) << 1 | (hay estado)
+_QUERIES = (_Q_ALL, _Q_STATUS, _Q_PROJ, _Q_BOTH)
 
 
 def add_project(name):
@@ -14,20 +41,18 @@ def add_project(name):
     Returns:
         int/None: ID del nuevo proyecto o None si falla.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT INTO projects (name, created_at) VALUES (?, ?)",
-            (name, datetime.now().isoformat()),
-        )
-        conn.commit()
-        return cursor.lastrowid
-    except sqlite3.IntegrityError:
-        print(f"Error: El proyecto '{name}' ya existe.")
-        return None
-    finally:
-        conn.close()
+    with get_write_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "INSERT INTO projects (name) VALUES (?)",
+                (name,),
+            )
+            conn.commit()
+            return cursor.lastrowid
+        except sqlite3.IntegrityError:
+            print(f"Error: El proyecto '{name}' ya existe.")
+            return None
 
 
 def add_task(title, project_name=None):
@@ -41,79 +66,79 @@ def add_task(title, project_name=None):
     Returns:
         int/None: ID de la nueva tarea o None si falla.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    project_id = None
-
-    if project_name:
-        # Buscar el ID del proyecto
-        cursor.execute("SELECT id FROM projects WHERE name = ?", (project_name,))
-        result = cursor.fetchone()
-        if result:
-            project_id = result[0]
-        else:
-            print(
-                f"Advertencia: Proyecto '{project_name}' no encontrado. Tarea creada sin asociación."
-            )
-
-    try:
-        cursor.execute(
-            "INSERT INTO tasks (title, project_id, created_at) VALUES (?, ?, ?)",
-            (title, project_id, datetime.now().isoformat()),
+    with get_write_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            project_id = None
+            if project_name and _HAS_RETURNING:
+                cursor.execute(_INSERT_TASK_RETURNING_SQL, (title, project_name))
+                project_id = cursor.fetchone()[0]
+                task_id = cursor.lastrowid
+            else:
+                cursor.execute(_INSERT_TASK_SQL, (title, project_name))
+                task_id = cursor.lastrowid
+                if project_name:
+                    # Sin RETURNING se relee la fila para comprobar la asociación
+                    cursor.execute(
+                        "SELECT project_id FROM tasks WHERE id = ?", (task_id,)
+                    )
+                    project_id = cursor.fetchone()[0]
+            conn.commit()
+        except Exception as e:
+            print(f"Error al añadir tarea: {e}")
+            return None
+
+    if project_name and project_id is None:
+        print(
+            f"Advertencia: Proyecto '{project_name}' no encontrado. Tarea creada sin asociación."
         )
-        conn.commit()
-        return cursor.lastrowid
-    except Exception as e:
-        print(f"Error al añadir tarea: {e}")
-        return None
-    finally:
-        conn.close()
+    return task_id
 
 
-def get_tasks(project_name=None, status=None):
+def add_tasks_bulk(tasks):
     """
-    Recupera tareas, filtrando opcionalmente por proyecto y estado.
+    Crea varias tareas en una única transacción.
 
     Args:
-        project_name (str/None): Nombre del proyecto para filtrar.
-        status (str/None): Estado de la tarea para filtrar.
+        tasks (list): Lista de tuplas (título, nombre_proyecto/None). Las
+            tareas cuyo proyecto no existe se crean sin asociación.
 
     Returns:
-        list: Lista de diccionarios (tareas con nombre de proyecto).
+        int/None: Número de tareas creadas o None si falla.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    query = """
-        SELECT
-            t.id, t.title, p.name as project_name, t.status
-        FROM tasks t
-        LEFT JOIN projects p ON t.project_id = p.id
-    """
-    conditions = []
-    params = []
-
-    if project_name:
-        conditions.append("p.name = ?")
-        params.append(project_name)
+    with get_write_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Un solo commit (y un solo fsync) para todas las filas
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.executemany(_INSERT_TASK_SQL, tasks)
+            conn.commit()
+            return cursor.rowcount
+        except Exception as e:
+            conn.rollback()
+            print(f"Error al añadir tareas: {e}")
+            return None
 
-    if status:
-        conditions.append("t.status = ?")
-        params.append(status)
 
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
-
-    query += " ORDER BY t.id DESC"
+def get_tasks(project_name=None, status=None):
+    """
+    Recupera tareas, filtrando opcionalmente por proyecto y estado.
 
-    cursor.execute(query, params)
+    Args:
+        project_name (str/None): Nombre del proyecto para filtrar.
+        status (str/None): Estado de la tarea para filtrar.
 
-    # Mapeo de resultados a una lista de diccionarios
-    results = cursor.fetchall()
-    columns = [desc[0] for desc in cursor.description]
-    tasks = [dict(zip(columns, row)) for row in results]
+    Yields:
+        sqlite3.Row: Tareas con nombre de proyecto, de la más reciente a la más antigua.
+    """
+    query = _QUERIES[(project_name is not None) << 1 | (status is not None)]
+    params = [value for value in (project_name, status) if value is not None]
 
-    conn.close()
-    return tasks
+    with get_connection() as conn:
+        # Las filas se entregan a medida que SQLite las produce; la conexión
+        # vuelve al pool cuando el generador se agota o se cierra.
+        # sqlite3.Row admite acceso tipo diccionario: task['title']
+        yield from conn.execute(query, params)
 
 
 def update_task_status(task_id, new_status):
@@ -127,19 +152,17 @@ def update_task_status(task_id, new_status):
     Returns:
         bool: True si la actualización fue exitosa, False en caso contrario.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "UPDATE tasks SET status = ? WHERE id = ?", (new_status, task_id)
-        )
-        conn.commit()
-        return cursor.rowcount > 0
-    except Exception as e:
-        print(f"Error al actualizar estado: {e}")
-        return False
-    finally:
-        conn.close()
+    with get_write_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "UPDATE tasks SET status = ? WHERE id = ?", (new_status, task_id)
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+        except Exception as e:
+            print(f"Error al actualizar estado: {e}")
+            return False
 
 
 # Otras funciones (edit_task, delete_task, etc.) seguirían este mismo patrón.
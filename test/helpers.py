@@ -0,0 +1,10 @@
+# tests/helpers.py
+"""Utilidades compartidas por los tests."""
+from core import database
+
+
+def close_pool(db_path):
+    """Cierra las conexiones del pool asociado a db_path, si llegó a crearse."""
+    pool = database._pools.pop(db_path, None)
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,75 @@
+# tests/test_commands.py
+import unittest
+import argparse
+import io
+from unittest import mock
+
+from core import commands
+
+
+def rows_generator(rows):
+    """Imita a get_tasks: un generador de un solo uso sobre las filas dadas."""
+    yield from rows
+
+
+class TestListTasksHandler(unittest.TestCase):
+    """Pruebas de handle_list_tasks con get_tasks simulado."""
+
+    def _run(self, rows):
+        """Ejecuta el handler con get_tasks parcheado y devuelve (salida, mock)."""
+        args = argparse.Namespace(project="Casa", status=None)
+        with mock.patch(
+            "core.task_manager.get_tasks", return_value=rows_generator(rows)
+        ) as get_tasks, mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            commands.handle_list_tasks(args)
+        return stdout.getvalue(), get_tasks
+
+    def test_empty_result_prints_message(self):
+        """Verificar el mensaje de resultado vacío sin imprimir la tabla."""
+        output, get_tasks = self._run([])
+
+        get_tasks.assert_called_once_with("Casa", None)
+        self.assertIn("No se encontraron tareas con los filtros especificados.", output)
+        self.assertNotIn("Lista de Tareas", output)
+
+    def test_rows_are_printed_once_in_order(self):
+        """Verificar que la primera fila (la leída para detectar vacío) sale una sola vez."""
+        rows = [
+            {"id": 2, "title": "Cocinar", "project_name": "Casa", "status": "pendiente"},
+            {"id": 1, "title": "Barrer", "project_name": "Casa", "status": "pendiente"},
+        ]
+
+        output, get_tasks = self._run(rows)
+
+        get_tasks.assert_called_once_with("Casa", None)
+        self.assertNotIn("No se encontraron tareas", output)
+        self.assertEqual(output.count("ID: **2**"), 1)
+        self.assertEqual(output.count("ID: **1**"), 1)
+        self.assertLess(output.index("Cocinar"), output.index("Barrer"))
+
+
+class TestCreateParser(unittest.TestCase):
+    """Pruebas de la construcción diferida de subparsers."""
+
+    def _registered_commands(self, argv):
+        """Devuelve los subcomandos registrados por create_parser(argv)."""
+        parser = commands.create_parser(argv)
+        return list(parser._subparsers._group_actions[0].choices)
+
+    def test_known_command_builds_only_its_subparser(self):
+        """Verificar que un subcomando conocido solo construye su propio subparser."""
+        self.assertEqual(self._registered_commands(["add-task", "x"]), ["add-task"])
+
+    def test_help_or_unknown_command_builds_all_subparsers(self):
+        """Verificar que '-h' o un comando inválido construyen los seis subparsers."""
+        for argv in (["-h"], ["bogus"]):
+            with self.subTest(argv=argv):
+                self.assertEqual(
+                    self._registered_commands(argv),
+                    list(commands.SUBCOMMAND_BUILDERS),
+                )
+                self.assertEqual(len(commands.SUBCOMMAND_BUILDERS), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
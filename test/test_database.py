@@ -1,58 +1,240 @@
 # tests/test_database.py
 import unittest
 import sqlite3
-import os
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from core.database import get_connection, initialize_db
+from unittest import mock
 
-# Usar una base de datos de prueba en memoria o un archivo temporal para los tests
-TEST_DB_FILE = ":memory:"  # Usaremos la memoria para la velocidad
+from core import database
+from core.database import initialize_db
+from helpers import close_pool
 
+# Base de datos en memoria compartida: todas las conexiones del proceso ven la
+# misma DB (con ":memory:" cada sqlite3.connect() crea una base nueva y vacía)
+TEST_DB_URI = "file:py_focus_test?mode=memory&cache=shared"
 
-class TestDatabase(unittest.TestCase):
-    """Pruebas unitarias para la inicialización y conexión a la DB."""
-
-    def setUp(self):
-        """Configuración: Inicializar la DB de prueba antes de cada test."""
-        # Sobrescribir la función get_connection para usar la DB de prueba
-        self.original_get_connection = get_connection
 
-        def mock_get_connection():
-            return sqlite3.connect(TEST_DB_FILE)
+@contextmanager
+def mock_get_connection(db_path=None):
+    """Presta una conexión a la base de datos de prueba en memoria."""
+    conn = sqlite3.connect(TEST_DB_URI, uri=True)
+    try:
+        yield conn
+    finally:
+        conn.close()
 
-        # Parchear la función globalmente (No es la forma más limpia, pero funciona para este scope)
-        import core.database
 
-        core.database.get_connection = mock_get_connection
+class TestDatabase(unittest.TestCase):
+    """Pruebas unitarias para la inicialización de la DB."""
 
-        initialize_db()
+    @classmethod
+    def setUpClass(cls):
+        """Configuración: Inicializar la DB de prueba una sola vez por clase."""
+        # La DB en memoria existe mientras quede al menos una conexión abierta
+        keepalive_conn = sqlite3.connect(TEST_DB_URI, uri=True)
+        cls.addClassCleanup(keepalive_conn.close)
 
-    def tearDown(self):
-        """Limpieza: Restaurar la conexión original (aunque en memoria no es estrictamente necesario)."""
-        import core.database
+        patcher = mock.patch("core.database.get_connection", new=mock_get_connection)
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
 
-        core.database.get_connection = self.original_get_connection
+        initialize_db()
 
     def test_tables_exist(self):
         """Verificar que las tablas projects, tasks y sessions fueron creadas."""
-        conn = get_connection()
-        cursor = conn.cursor()
+        with database.get_connection() as conn:
+            cursor = conn.cursor()
 
-        # Consulta para verificar la existencia de la tabla
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = [row[0] for row in cursor.fetchall()]
-        conn.close()
+            # Consulta para verificar la existencia de la tabla
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+            tables = [row[0] for row in cursor.fetchall()]
 
         self.assertIn("projects", tables)
         self.assertIn("tasks", tables)
         self.assertIn("sessions", tables)
 
-    def test_connection_successful(self):
-        """Verificar que la función de conexión devuelve un objeto válido."""
-        conn = get_connection()
-        self.assertIsInstance(conn, sqlite3.Connection)
+    def test_schema_version_recorded(self):
+        """Verificar que initialize_db guarda SCHEMA_VERSION en la DB."""
+        with database.get_connection() as conn:
+            version = conn.execute("PRAGMA user_version;").fetchone()[0]
+
+        self.assertEqual(version, database.SCHEMA_VERSION)
+
+    def test_outdated_schema_is_reapplied(self):
+        """Verificar que una versión distinta vuelve a ejecutar el DDL."""
+        with database.get_connection() as conn:
+            conn.execute("DROP INDEX idx_tasks_status;")
+            conn.execute("PRAGMA user_version = 0;")
+            conn.commit()
+
+        initialize_db()
+
+        with database.get_connection() as conn:
+            indexes = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='index';"
+                )
+            ]
+        self.assertIn("idx_tasks_status", indexes)
+
+
+# Esquema anterior a los DEFAULT de marca de tiempo (created_at/start_time)
+LEGACY_SCHEMA = """
+CREATE TABLE projects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    project_id INTEGER,
+    status TEXT NOT NULL DEFAULT 'pendiente',
+    is_subtask INTEGER DEFAULT 0,
+    parent_task_id INTEGER,
+    created_at TEXT NOT NULL,
+    FOREIGN KEY (project_id) REFERENCES projects(id)
+);
+CREATE TABLE sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT,
+    duration_minutes INTEGER,
+    type TEXT NOT NULL,
+    FOREIGN KEY (task_id) REFERENCES tasks(id)
+);
+INSERT INTO projects (name, created_at) VALUES ('Old', '2024-01-01T10:00:00');
+INSERT INTO tasks (title, project_id, created_at) VALUES ('T', 1, '2024-01-01T10:00:00');
+INSERT INTO sessions (task_id, start_time, duration_minutes, type)
+    VALUES (1, '2024-01-01T10:00:00', 25, 'trabajo');
+"""
+
+
+class TestLegacyMigration(unittest.TestCase):
+    """Pruebas de la migración de DB creadas con el esquema antiguo."""
+
+    def setUp(self):
+        """Configuración: Crear una DB con el esquema antiguo en un archivo temporal."""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.db_path = Path(tmp_dir.name) / "legacy.db"
+        self.addCleanup(close_pool, self.db_path)
+
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(LEGACY_SCHEMA)
         conn.close()
 
+    def test_migration_keeps_data_and_adds_defaults(self):
+        """Verificar que la migración conserva las filas y añade los DEFAULT."""
+        database.initialize_db(self.db_path)
+
+        with database.get_connection(self.db_path) as conn:
+            self.assertEqual(
+                conn.execute("PRAGMA user_version;").fetchone()[0],
+                database.SCHEMA_VERSION,
+            )
+            project = conn.execute("SELECT name, created_at FROM projects;").fetchone()
+            self.assertEqual(tuple(project), ("Old", "2024-01-01T10:00:00"))
+            self.assertEqual(
+                conn.execute("SELECT COUNT(*) FROM sessions;").fetchone()[0], 1
+            )
+
+            conn.execute("INSERT INTO projects (name) VALUES ('New');")
+            conn.execute("INSERT INTO tasks (title, project_id) VALUES ('X', 1);")
+            conn.execute("INSERT INTO sessions (task_id, type) VALUES (2, 'trabajo');")
+            conn.commit()
+
+            new_task = conn.execute(
+                "SELECT id, created_at FROM tasks WHERE title = 'X';"
+            ).fetchone()
+            self.assertEqual(new_task[0], 2)
+            self.assertTrue(new_task[1].endswith("Z"))
+            self.assertEqual(conn.execute("PRAGMA foreign_key_check;").fetchall(), [])
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Pruebas unitarias del pool de conexiones sobre un archivo temporal."""
+
+    def setUp(self):
+        """Configuración: Crear un pool pequeño sobre una DB temporal."""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_path = Path(tmp_dir.name)
+        self.pool = database.ConnectionPool(
+            self.tmp_path / "pool.db", size=2, timeout=0.1
+        )
+        self.addCleanup(self.pool.close)
+
+    def test_connection_successful(self):
+        """Verificar que get_connection presta una conexión y la devuelve al pool."""
+        db_path = self.tmp_path / "registry.db"
+        self.addCleanup(close_pool, db_path)
+
+        with database.get_connection(db_path) as conn:
+            self.assertIsInstance(conn, sqlite3.Connection)
+            self.assertEqual(database._pools[db_path]._pool.qsize(), 0)
+
+        # Al salir del bloque la conexión vuelve al pool en lugar de cerrarse
+        with database.get_connection(db_path) as reused:
+            self.assertIs(reused, conn)
+
+    def test_connections_are_reused_lifo(self):
+        """Verificar que get() reutiliza primero la última conexión devuelta."""
+        first = self.pool.get()
+        second = self.pool.get()
+        self.pool.put(first)
+        self.pool.put(second)
+
+        self.assertIs(self.pool.get(), second)
+        self.assertIs(self.pool.get(), first)
+        self.assertEqual(self.pool._created, 2)
+        self.pool.put(first)
+        self.pool.put(second)
+
+    def test_put_rolls_back_open_transaction(self):
+        """Verificar que put() descarta una transacción sin confirmar."""
+        conn = self.pool.get()
+        conn.execute("CREATE TABLE t (x INTEGER);")
+        conn.execute("INSERT INTO t VALUES (1);")
+        self.assertTrue(conn.in_transaction)
+
+        self.pool.put(conn)
+
+        self.assertFalse(conn.in_transaction)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM t;").fetchone()[0], 0)
+
+    def test_failed_connect_releases_slot(self):
+        """Verificar que un fallo al conectar no consume un hueco del pool."""
+        with mock.patch.object(
+            self.pool, "_connect", side_effect=sqlite3.OperationalError("boom")
+        ):
+            with self.assertRaises(sqlite3.OperationalError):
+                self.pool.get()
+
+        self.assertEqual(self.pool._created, 0)
+
+    def test_new_connections_are_configured(self):
+        """Verificar row_factory y PRAGMAs de las conexiones nuevas."""
+        conn = self.pool.get()
+        self.addCleanup(self.pool.put, conn)
+
+        self.assertIs(conn.row_factory, sqlite3.Row)
+        self.assertEqual(conn.execute("PRAGMA journal_mode;").fetchone()[0], "wal")
+        self.assertEqual(conn.execute("PRAGMA synchronous;").fetchone()[0], 1)
+        self.assertEqual(conn.execute("PRAGMA foreign_keys;").fetchone()[0], 1)
+
+    def test_exhausted_pool_times_out(self):
+        """Verificar que get() falla con un error claro si el pool está agotado."""
+        conns = [self.pool.get(), self.pool.get()]
+        for conn in conns:
+            self.addCleanup(self.pool.put, conn)
+
+        with self.assertRaises(TimeoutError):
+            self.pool.get()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,123 @@
+# tests/test_pomodoro.py
+import unittest
+import io
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from core import database, pomodoro
+from core.pomodoro import PomodoroTimer
+from helpers import close_pool
+
+# Duraciones cortas (en minutos) para que las fases terminen en décimas de segundo
+SHORT_MIN = 0.3 / 60
+LONG_MIN = 1
+
+
+class TestPomodoroTimer(unittest.TestCase):
+    """Pruebas del temporizador Pomodoro con duraciones cortas sobre una DB temporal."""
+
+    def setUp(self):
+        """Configuración: DB temporal con una tarea y salida de la CLI silenciada."""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.db_path = Path(tmp_dir.name) / "pomodoro.db"
+        self.addCleanup(close_pool, self.db_path)
+
+        database.initialize_db(self.db_path)
+        with database.get_connection(self.db_path) as conn:
+            self.task_id = conn.execute(
+                "INSERT INTO tasks (title) VALUES ('Tarea');"
+            ).lastrowid
+            conn.commit()
+
+        for patcher in (
+            mock.patch.object(
+                pomodoro,
+                "get_write_connection",
+                new=lambda: database.get_write_connection(self.db_path),
+            ),
+            mock.patch("sys.stdout", new_callable=io.StringIO),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _start(self, work_min, break_min):
+        """Arranca un temporizador y garantiza su cancelación al terminar el test."""
+        timer = PomodoroTimer(self.task_id, work_min=work_min, break_min=break_min)
+        self.assertTrue(timer.start())
+        self.addCleanup(self._stop, timer)
+        return timer
+
+    def _stop(self, timer):
+        """Cancela el temporizador y espera a que su hilo termine."""
+        timer.cancel()
+        timer._timer_thread.join(timeout=2)
+
+    def _sessions(self):
+        """Devuelve las sesiones guardadas como (tipo, completada)."""
+        with database.get_connection(self.db_path) as conn:
+            rows = conn.execute("SELECT type, end_time FROM sessions ORDER BY id;")
+            return [(row["type"], row["end_time"] is not None) for row in rows]
+
+    def _wait_for(self, condition, timeout=3):
+        """Espera (sondeando) hasta que condition() sea verdadera."""
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("La condición no se cumplió a tiempo.")
+            time.sleep(0.02)
+
+    def test_start_unknown_task_returns_false(self):
+        """Verificar que start() rechaza una Tarea ID inexistente sin lanzar el hilo."""
+        timer = PomodoroTimer(self.task_id + 1000)
+
+        self.assertFalse(timer.start())
+        self.assertFalse(timer.is_running())
+        self.assertIsNone(timer._timer_thread)
+        self.assertEqual(self._sessions(), [])
+
+    def test_cancel_stops_phase_immediately(self):
+        """Verificar que cancel() termina la fase al instante y limpia is_running()."""
+        timer = self._start(LONG_MIN, LONG_MIN)
+
+        cancelled_at = time.monotonic()
+        self.assertTrue(timer.cancel())
+        timer._timer_thread.join(timeout=1)
+
+        self.assertLess(time.monotonic() - cancelled_at, 0.5)
+        self.assertFalse(timer._timer_thread.is_alive())
+        self.assertFalse(timer.is_running())
+        self.assertEqual(self._sessions(), [("trabajo", False)])
+
+    def test_pause_extends_deadline(self):
+        """Verificar que el tiempo en pausa se suma al plazo de la fase."""
+        timer = self._start(SHORT_MIN, LONG_MIN)
+
+        time.sleep(0.1)
+        self.assertTrue(timer.pause())
+        time.sleep(0.4)
+        self.assertTrue(timer.resume())
+
+        # Sin pausa la fase ya habría terminado (0.3 s); con pausa le quedan ~0.2 s
+        self.assertEqual(self._sessions(), [("trabajo", False)])
+        self._wait_for(lambda: ("trabajo", True) in self._sessions())
+
+    def test_work_break_work_cycle(self):
+        """Verificar que las fases se encadenan trabajo → descanso → trabajo."""
+        timer = self._start(SHORT_MIN, SHORT_MIN)
+
+        self._wait_for(lambda: len(self._sessions()) >= 3)
+
+        sessions = self._sessions()
+        self.assertEqual(
+            [session_type for session_type, _ in sessions[:3]],
+            ["trabajo", "descanso", "trabajo"],
+        )
+        self.assertEqual([done for _, done in sessions[:2]], [True, True])
+        self.assertTrue(timer.is_running())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+# tests/test_task_manager.py
+import unittest
+import io
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from core import database, task_manager
+from helpers import close_pool
+
+
+class TestTaskManager(unittest.TestCase):
+    """Pruebas unitarias del CRUD de tareas sobre una DB temporal."""
+
+    def setUp(self):
+        """Configuración: Inicializar una DB temporal y dirigir task_manager a ella."""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.db_path = Path(tmp_dir.name) / "tasks.db"
+        self.addCleanup(close_pool, self.db_path)
+
+        database.initialize_db(self.db_path)
+        for name in ("get_connection", "get_write_connection"):
+            connect = getattr(database, name)
+            patcher = mock.patch.object(
+                task_manager, name, new=lambda connect=connect: connect(self.db_path)
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _count_tasks(self):
+        """Devuelve el número de tareas guardadas."""
+        with database.get_connection(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM tasks;").fetchone()[0]
+
+    def test_add_task_links_existing_project(self):
+        """Verificar que add_task resuelve el proyecto por nombre."""
+        project_id = task_manager.add_project("Casa")
+        task_id = task_manager.add_task("Limpiar", "Casa")
+
+        with database.get_connection(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT project_id FROM tasks WHERE id = ?;", (task_id,)
+            ).fetchone()
+        self.assertEqual(row[0], project_id)
+
+    def test_add_task_links_existing_project_without_returning(self):
+        """Verificar la relectura de project_id cuando SQLite no soporta RETURNING."""
+        project_id = task_manager.add_project("Casa")
+        with mock.patch.object(task_manager, "_HAS_RETURNING", False):
+            task_id = task_manager.add_task("Limpiar", "Casa")
+
+        with database.get_connection(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT project_id FROM tasks WHERE id = ?;", (task_id,)
+            ).fetchone()
+        self.assertEqual(row[0], project_id)
+
+    def test_add_task_missing_project_warns_and_stores_null(self):
+        """Verificar que un proyecto inexistente deja project_id NULL con advertencia."""
+        for has_returning in (True, False):
+            with self.subTest(has_returning=has_returning):
+                with mock.patch.object(
+                    task_manager, "_HAS_RETURNING", has_returning
+                ), mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+                    task_id = task_manager.add_task("Suelta", "NoExiste")
+
+                self._assert_unlinked_with_warning(task_id, stdout.getvalue())
+
+    def _assert_unlinked_with_warning(self, task_id, output):
+        """Comprueba que la tarea existe sin proyecto y que se advirtió."""
+        self.assertIsNotNone(task_id)
+        self.assertIn("Proyecto 'NoExiste' no encontrado", output)
+        with database.get_connection(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT project_id FROM tasks WHERE id = ?;", (task_id,)
+            ).fetchone()
+        self.assertIsNone(row[0])
+
+    def test_add_tasks_bulk_returns_count(self):
+        """Verificar que add_tasks_bulk inserta todas las filas y devuelve cuántas."""
+        task_manager.add_project("Casa")
+
+        created = task_manager.add_tasks_bulk(
+            [("Uno", "Casa"), ("Dos", None), ("Tres", "NoExiste")]
+        )
+
+        self.assertEqual(created, 3)
+        self.assertEqual(self._count_tasks(), 3)
+
+    def test_add_tasks_bulk_rolls_back_on_bad_row(self):
+        """Verificar que una fila inválida deshace todo el lote."""
+        with mock.patch("sys.stdout", new_callable=io.StringIO):
+            created = task_manager.add_tasks_bulk([("Uno", None), (None, None)])
+
+        self.assertIsNone(created)
+        self.assertEqual(self._count_tasks(), 0)
+
+    def _seed_tasks(self):
+        """Crea dos proyectos y cuatro tareas con estados variados; devuelve sus IDs."""
+        task_manager.add_project("Casa")
+        task_manager.add_project("Oficina")
+        with mock.patch("sys.stdout", new_callable=io.StringIO):
+            ids = {
+                title: task_manager.add_task(title, project)
+                for title, project in (
+                    ("Barrer", "Casa"),
+                    ("Informe", "Oficina"),
+                    ("Cocinar", "Casa"),
+                    ("Leer", None),
+                )
+            }
+        task_manager.update_task_status(ids["Cocinar"], "completado")
+        task_manager.update_task_status(ids["Leer"], "completado")
+        return ids
+
+    def test_get_tasks_filter_combinations(self):
+        """Verificar las cuatro combinaciones de filtros y el orden id DESC."""
+        ids = self._seed_tasks()
+        cases = (
+            ({}, ["Leer", "Cocinar", "Informe", "Barrer"]),
+            ({"status": "completado"}, ["Leer", "Cocinar"]),
+            ({"project_name": "Casa"}, ["Cocinar", "Barrer"]),
+            ({"project_name": "Casa", "status": "pendiente"}, ["Barrer"]),
+        )
+        for filters, expected_titles in cases:
+            with self.subTest(**filters):
+                rows = list(task_manager.get_tasks(**filters))
+
+                self.assertEqual([row["title"] for row in rows], expected_titles)
+                self.assertEqual(
+                    [row["id"] for row in rows],
+                    [ids[title] for title in expected_titles],
+                )
+
+    def test_get_tasks_rows_allow_access_by_name(self):
+        """Verificar que las filas son sqlite3.Row con el nombre del proyecto."""
+        self._seed_tasks()
+
+        rows = list(task_manager.get_tasks(status="pendiente"))
+
+        self.assertIsInstance(rows[0], sqlite3.Row)
+        self.assertEqual(
+            [(row["title"], row["project_name"], row["status"]) for row in rows],
+            [("Informe", "Oficina", "pendiente"), ("Barrer", "Casa", "pendiente")],
+        )
+        leer = list(task_manager.get_tasks(status="completado"))[0]
+        self.assertIsNone(leer["project_name"])
+
+    def test_get_tasks_close_returns_connection_to_pool(self):
+        """Verificar que cerrar el generador a medias devuelve la conexión al pool."""
+        self._seed_tasks()
+        pool = database._pools[self.db_path]
+        idle_before = pool._pool.qsize()
+
+        gen = task_manager.get_tasks()
+        next(gen)
+        self.assertEqual(pool._pool.qsize(), idle_before - 1)
+
+        gen.close()
+        self.assertEqual(pool._pool.qsize(), idle_before)
+
+
+if __name__ == "__main__":
+    unittest.main()